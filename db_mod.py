@@ -5,13 +5,17 @@
 
 
 import os
+import re
+import threading
+import time
 from dotenv import load_dotenv
 import mysql.connector
 from mysql.connector import Error
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 import queries
-from utils import safe_execute
+from utils import safe_execute, QueryShedError, QueryTimeoutError
+from singleflight import SingleFlight
 
 logging.basicConfig(
     filename='db_manager.log',
@@ -22,6 +26,143 @@ logging.basicConfig(
 
 load_dotenv()
 
+# Time budgets (milliseconds) per query type, enforced by the server through
+# a MAX_EXECUTION_TIME hint and by the client through KILL QUERY.
+QUERY_TIME_BUDGETS_MS: Dict[str, int] = {
+    "default": 5000,
+    "category_search": 2000,
+    "title_search": 2000,
+    "year_search": 2000,
+    "category_year_search": 3000,
+    "actor_search": 4000,
+    "keyword_search": 4000,
+    "analytics": 5000,
+    "maintenance": 600000,
+}
+
+# Query types that are admitted only while the database has capacity for them.
+EXPENSIVE_QUERY_TYPES = {"actor_search", "keyword_search"}
+
+MAX_CONCURRENT_EXPENSIVE = int(os.getenv("MAX_CONCURRENT_EXPENSIVE_QUERIES", "4"))
+# Server-wide Threads_running at which expensive queries are no longer admitted, 0 to disable.
+MAX_THREADS_RUNNING = int(os.getenv("MAX_THREADS_RUNNING", "16"))
+STATUS_CACHE_SECONDS = 1.0
+ADMISSION_WAIT_SECONDS = 0.1
+CANCEL_GRACE_MS = 500
+
+# MySQL errors raised for a statement stopped by MAX_EXECUTION_TIME or KILL QUERY.
+TIMEOUT_ERRNOS = {3024, 1317}
+
+
+class AdmissionController:
+    """
+    Admits expensive queries only while the database has capacity for them.
+
+    Two limits apply. The server-wide one rejects expensive queries while the
+    server's Threads_running, read at most once per STATUS_CACHE_SECONDS, is at
+    or above max_threads_running; it sees load from every client. The local one
+    caps expensive queries running at once in this process; one instance can be
+    shared by several QueryExecutors so the cap covers all of them.
+
+    Attributes:
+        max_concurrent (int): The number of expensive queries admitted at once in this process.
+        max_threads_running (int): The server Threads_running at which the
+            database counts as saturated, 0 to disable the check.
+        stats (Dict[str, int]): Counters of admitted, shed, degraded, timed out
+            and cancelled queries.
+    """
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_EXPENSIVE,
+                 max_threads_running: int = MAX_THREADS_RUNNING):
+        """
+        Initializes the AdmissionController.
+
+        Args:
+            max_concurrent (int): The number of expensive queries admitted at once in this process.
+            max_threads_running (int): The server Threads_running at which the
+                database counts as saturated, 0 to disable the check.
+        """
+        self.max_concurrent = max_concurrent
+        self.max_threads_running = max_threads_running
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._threads_running: Optional[int] = None
+        self._checked_at = float("-inf")
+        self.stats: Dict[str, int] = {
+            "admitted": 0,
+            "shed": 0,
+            "degraded": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+        }
+
+    def acquire(self, query_type: Optional[str],
+                threads_running: Optional[Callable[[], Optional[int]]] = None) -> bool:
+        """
+        Tries to take a slot for the query type.
+
+        Cheap query types are always admitted without taking a slot.
+
+        Args:
+            query_type (Optional[str]): The type of the query.
+            threads_running (Optional[Callable[[], Optional[int]]]):
+                Reads the server's Threads_running, or returns None if it cannot.
+
+        Returns:
+            bool: True if the query may run, False if the database is saturated.
+        """
+        if query_type not in EXPENSIVE_QUERY_TYPES:
+            return True
+        if threads_running is not None and self._server_saturated(threads_running):
+            return False
+        if self._slots.acquire(timeout=ADMISSION_WAIT_SECONDS):
+            self.count("admitted")
+            return True
+        return False
+
+    def _server_saturated(self, threads_running: Callable[[], Optional[int]]) -> bool:
+        """
+        Compares the server's Threads_running, cached for STATUS_CACHE_SECONDS,
+        with max_threads_running.
+
+        Args:
+            threads_running (Callable[[], Optional[int]]): Reads the server's Threads_running.
+
+        Returns:
+            bool: True if the server is saturated. False if the check is disabled
+            or the status cannot be read.
+        """
+        if not self.max_threads_running:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            stale = now - self._checked_at >= STATUS_CACHE_SECONDS
+            if stale:
+                self._checked_at = now
+        if stale:
+            self._threads_running = threads_running()
+        return self._threads_running is not None and self._threads_running >= self.max_threads_running
+
+    def release(self, query_type: Optional[str]) -> None:
+        """
+        Frees the slot taken for the query type.
+
+        Args:
+            query_type (Optional[str]): The type of the query.
+        """
+        if query_type in EXPENSIVE_QUERY_TYPES:
+            self._slots.release()
+
+    def count(self, counter: str) -> None:
+        """
+        Increments one of the counters in stats.
+
+        Args:
+            counter (str): The name of the counter.
+        """
+        with self._lock:
+            self.stats[counter] += 1
+
+
 class ConnectionManager:
     """
     Manages database connections for multiple databases.
@@ -35,6 +176,20 @@ class ConnectionManager:
         Initializes the ConnectionManager and connects to the databases.
         """
         self.connections: Dict[str, mysql.connector.MySQLConnection] = {}
+        self.configs: Dict[str, Dict[str, Optional[str]]] = {
+            'sakila': {
+                "host": os.getenv("DB_HOST"),
+                "user": os.getenv("DB_USER"),
+                "password": os.getenv("DB_PASSWORD"),
+                "database": os.getenv("DB_NAME"),
+            },
+            'queries': {
+                "host": os.getenv("DBQ_HOST"),
+                "user": os.getenv("DBQ_USER"),
+                "password": os.getenv("DBQ_PASSWORD"),
+                "database": os.getenv("DBQ_NAME"),
+            },
+        }
         self.initialize_connections()
         self.main_db = "sakila"  # Main database name
         self.log_db = "queries"  # Logging database name
@@ -56,22 +211,24 @@ class ConnectionManager:
             Error: If a connection to any database fails.
         """
         try:
-            self.connections['sakila'] = mysql.connector.connect(
-                host=os.getenv("DB_HOST"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                database=os.getenv("DB_NAME")
-            )
-            self.connections['queries'] = mysql.connector.connect(
-                host=os.getenv("DBQ_HOST"),
-                user=os.getenv("DBQ_USER"),
-                password=os.getenv("DBQ_PASSWORD"),
-                database=os.getenv("DBQ_NAME")
-            )
+            for db_name in self.configs:
+                self.connections[db_name] = self.open_connection(db_name)
         except Error as e:
             logging.error(f"Database connection error: {e}")
             raise ConnectionError("Sorry! Failed to connect to one or more databases. Please, try next time") from e 
 
+    def open_connection(self, db_name: str) -> mysql.connector.MySQLConnection:
+        """
+        Opens a new connection to the specified database.
+
+        Args:
+            db_name (str): The name of the database.
+
+        Returns:
+            mysql.connector.MySQLConnection: A new connection, not tracked by the manager.
+        """
+        return mysql.connector.connect(**self.configs[db_name])
+
     @safe_execute
     def get_connection(self, db_name: str) -> mysql.connector.MySQLConnection:
         """
@@ -113,42 +270,192 @@ class QueryExecutor:
     Attributes:
         connection_manager (ConnectionManager):
             The manager responsible for providing database connections.
+        admission (Optional[AdmissionController]):
+            The controller limiting concurrent expensive queries.
+        single_flight (SingleFlight):
+            Collapses concurrent identical SELECT queries into one execution.
     """
-    def __init__(self, connection_manager: ConnectionManager):
+    def __init__(self, connection_manager: ConnectionManager, admission: Optional[AdmissionController] = None,
+                 single_flight: Optional[SingleFlight] = None):
         """
         Initializes the QueryExecutor with a ConnectionManager instance.
 
         Args:
             connection_manager (ConnectionManager):
                 The manager responsible for managing database connections.
+            admission (Optional[AdmissionController]):
+                The controller limiting concurrent expensive queries.
+                A private one is created if not given.
+            single_flight (Optional[SingleFlight]):
+                Collapses concurrent identical SELECT queries into one execution.
+                A private one is created if not given.
         """
         self.connection_manager = connection_manager
+        self.admission = admission or AdmissionController()
+        self.single_flight = single_flight or SingleFlight()
     
     @safe_execute
-    def execute_select(self, db_name: str, query: str, params: Optional[tuple] = None) -> List[Any]:
+    def execute_select(self, db_name: str, query: str, params: Optional[tuple] = None,
+                       query_type: Optional[str] = None,
+                       fallback: Optional[Tuple[str, Optional[tuple]]] = None) -> List[Any]:
         """
-        Executes a SELECT query on the specified database.
+        Executes a SELECT query on the specified database within the time budget of its type.
+
+        Concurrent calls with the same database, query and parameters share
+        one execution and its result.
+
+        Expensive query types must be admitted by the AdmissionController.
+        When the database is saturated the fallback query is run instead,
+        or the query is rejected if there is no fallback.
+
+        Errors are handled by safe_execute, which tells the user whether the
+        server was busy, the query took too long or it failed, and returns None.
 
         Args:
             db_name (str): The name of the database.
             query (str): The SQL SELECT query to execute.
             params (Optional[tuple]): Parameters for the SQL query.
+            query_type (Optional[str]): The type of the query, a key of QUERY_TIME_BUDGETS_MS.
+            fallback (Optional[Tuple[str, Optional[tuple]]]):
+                A cheaper query and its parameters to run when the database is saturated.
+
+        Returns:
+            List[Any]: The results of the SELECT query, or None if it was
+            rejected, timed out or failed.
+        """
+        rows = self.single_flight.do(
+            (db_name, query, params),
+            lambda: self._admit_and_select(db_name, query, params, query_type, fallback),
+        )
+        # Each caller gets its own list; the shared rows are immutable tuples.
+        return list(rows)
+
+    def _admit_and_select(self, db_name: str, query: str, params: Optional[tuple],
+                          query_type: Optional[str],
+                          fallback: Optional[Tuple[str, Optional[tuple]]]) -> List[Any]:
+        """
+        Runs a SELECT query once admitted by the AdmissionController, or its fallback.
+
+        Args:
+            db_name (str): The name of the database.
+            query (str): The SQL SELECT query to execute.
+            params (Optional[tuple]): Parameters for the SQL query.
+            query_type (Optional[str]): The type of the query.
+            fallback (Optional[Tuple[str, Optional[tuple]]]):
+                A cheaper query and its parameters to run when the database is saturated.
 
         Returns:
             List[Any]: The results of the SELECT query.
 
         Raises:
-            Error: If the query execution fails.
+            QueryShedError: If the query is rejected by admission control.
+            QueryTimeoutError: If the query exceeds its time budget.
+            RuntimeError: If the query execution fails.
+        """
+        budget_ms = QUERY_TIME_BUDGETS_MS.get(query_type, QUERY_TIME_BUDGETS_MS["default"])
+        if not self.admission.acquire(query_type, lambda: self._threads_running(db_name)):
+            if fallback is None:
+                self.admission.count("shed")
+                logging.error(f"Query shed, database saturated: {query_type}")
+                raise QueryShedError(f"Query rejected, database saturated: {query_type}")
+            self.admission.count("degraded")
+            query, params = fallback
+            return self._select_with_budget(db_name, query, params, budget_ms)
+        try:
+            return self._select_with_budget(db_name, query, params, budget_ms)
+        finally:
+            self.admission.release(query_type)
+
+    def _select_with_budget(self, db_name: str, query: str, params: Optional[tuple], budget_ms: int) -> List[Any]:
+        """
+        Runs a SELECT query with a MAX_EXECUTION_TIME hint and a client-side
+        watchdog that kills the query if the server does not stop it in time.
+
+        Args:
+            db_name (str): The name of the database.
+            query (str): The SQL SELECT query to execute.
+            params (Optional[tuple]): Parameters for the SQL query.
+            budget_ms (int): The time budget in milliseconds.
+
+        Returns:
+            List[Any]: The results of the SELECT query.
+
+        Raises:
+            QueryTimeoutError: If the query exceeds its time budget.
+            RuntimeError: If the query execution fails.
         """
         try:
             connection = self.connection_manager.get_connection(db_name)
-            with connection.cursor() as cursor:
-                cursor.execute(query, params)
-                return cursor.fetchall()
+            execution = _Execution()
+            watchdog = threading.Timer(
+                (budget_ms + CANCEL_GRACE_MS) / 1000,
+                self._cancel_query,
+                args=(db_name, connection.connection_id, execution),
+            )
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(_with_time_budget(query, budget_ms), params)
+                    return cursor.fetchall()
+            finally:
+                # Waits for a KILL already in progress, so it cannot hit the next statement.
+                with execution.lock:
+                    execution.done = True
+                watchdog.cancel()
         except Error as e:
+            if e.errno in TIMEOUT_ERRNOS:
+                self.admission.count("timed_out")
+                logging.error(f"Query timed out after {budget_ms} ms: {e}")
+                raise QueryTimeoutError(f"Query exceeded {budget_ms} ms") from e
             logging.error(f"Query execution error (SELECT): {e}")
             raise RuntimeError from e
 
+    def _threads_running(self, db_name: str) -> Optional[int]:
+        """
+        Reads the number of statements currently running on the server.
+
+        Args:
+            db_name (str): The name of the database.
+
+        Returns:
+            Optional[int]: The server's Threads_running, or None if it cannot be read.
+        """
+        try:
+            connection = self.connection_manager.get_connection(db_name)
+            with connection.cursor() as cursor:
+                cursor.execute(queries.threads_running)
+                rows = cursor.fetchall()
+            return int(rows[0][1]) if rows else None
+        except Error as e:
+            logging.error(f"Server status error: {e}")
+            return None
+
+    def _cancel_query(self, db_name: str, connection_id: int, execution: "_Execution") -> None:
+        """
+        Kills the statement running on a connection, using a separate connection.
+
+        Nothing is killed if the execution has already finished.
+
+        Args:
+            db_name (str): The name of the database.
+            connection_id (int): The server thread ID of the connection to cancel.
+            execution (_Execution): The state of the execution to cancel.
+        """
+        with execution.lock:
+            if execution.done:
+                return
+            try:
+                killer = self.connection_manager.open_connection(db_name)
+                try:
+                    with killer.cursor() as cursor:
+                        cursor.execute(f"KILL QUERY {int(connection_id)}")
+                finally:
+                    killer.close()
+                self.admission.count("cancelled")
+            except Error as e:
+                logging.error(f"Query cancellation error: {e}")
+
     @safe_execute
     def execute_non_select(self, db_name: str, query: str, params: Optional[tuple] = None) -> None:
         """
@@ -172,6 +479,35 @@ class QueryExecutor:
             raise RuntimeError from e
 
 
+class _Execution:
+    """
+    The state of one SELECT execution shared with its watchdog.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.done = False
+
+
+def _with_time_budget(query: str, budget_ms: int) -> str:
+    """
+    Adds a MAX_EXECUTION_TIME optimizer hint to a SELECT query.
+
+    Args:
+        query (str): The SQL SELECT query.
+        budget_ms (int): The time budget in milliseconds.
+
+    Returns:
+        str: The query with the hint after its first SELECT keyword.
+    """
+    return re.sub(
+        r"^\s*SELECT\b",
+        f"SELECT /*+ MAX_EXECUTION_TIME({int(budget_ms)}) */",
+        query,
+        count=1,
+        flags=re.IGNORECASE,
+    )
+
+
 # In[ ]:
 
 
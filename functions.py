@@ -9,6 +9,10 @@ import queries
 from db_mod import QueryExecutor
 from utils import safe_execute
 
+# Default ngram_token_size of the FULLTEXT parser; shorter terms cannot be
+# matched by the FULLTEXT indexes and are searched with LIKE instead.
+NGRAM_TOKEN_SIZE = 2
+
 # Search Functions
 
 @safe_execute
@@ -41,7 +45,7 @@ def movies_by_category(query_executor: QueryExecutor, db_name: str, category_id:
     """
     query = queries.search_by_category
     params = (category_id,)
-    return query_executor.execute_select(db_name, query, params)    
+    return query_executor.execute_select(db_name, query, params, query_type="category_search")
 
 @safe_execute
 def movies_by_year(query_executor: QueryExecutor, db_name: str, year: int):
@@ -58,7 +62,7 @@ def movies_by_year(query_executor: QueryExecutor, db_name: str, year: int):
     """
     query = queries.search_by_year
     params = (year,)
-    return query_executor.execute_select(db_name, query, params)
+    return query_executor.execute_select(db_name, query, params, query_type="year_search")
 
 @safe_execute
 def movies_by_category_and_year(query_executor: QueryExecutor, db_name: str, category_name: str, year: int):
@@ -76,7 +80,7 @@ def movies_by_category_and_year(query_executor: QueryExecutor, db_name: str, cat
     """
     query = queries.search_by_category_and_year
     params = (category_name, year)
-    return query_executor.execute_select(db_name, query, params)
+    return query_executor.execute_select(db_name, query, params, query_type="category_year_search")
 
 @safe_execute    
 def movies_by_title(query_executor: QueryExecutor, db_name: str, title: str):
@@ -93,12 +97,13 @@ def movies_by_title(query_executor: QueryExecutor, db_name: str, title: str):
     """
     query = queries.search_by_title
     params = (f"%{title}%",)
-    return query_executor.execute_select(db_name, query, params)
+    return query_executor.execute_select(db_name, query, params, query_type="title_search")
 
 @safe_execute
 def movies_by_actor(query_executor: QueryExecutor, db_name: str, actor_name: str):
     """
     Fetches movies with the specified actor.
+    Names shorter than NGRAM_TOKEN_SIZE are matched with LIKE instead of the FULLTEXT index.
 
     Args:
         query_executor (QueryExecutor): The query executor instance.
@@ -106,16 +111,22 @@ def movies_by_actor(query_executor: QueryExecutor, db_name: str, actor_name: str
         actor_name (str): The name of the actor to search for.
 
     Returns:
-        List[tuple]: A list of tuples with movie details and actor names.
+        List[tuple]: A list of tuples with movie titles and their comma-separated actor names.
     """
-    query = queries.search_by_actor
-    params = (f"%{actor_name}%",)
-    return query_executor.execute_select(db_name, query, params)
+    if len(actor_name.strip()) < NGRAM_TOKEN_SIZE:
+        query = queries.search_by_actor_short
+        params = (f"%{actor_name}%",)
+    else:
+        query = queries.search_by_actor
+        params = (_phrase(actor_name),)
+    return query_executor.execute_select(db_name, query, params, query_type="actor_search")
 
 @safe_execute
 def movies_by_keyword(query_executor: QueryExecutor, db_name: str, keyword: str):
     """
     Fetches movies that match the given keyword in title, actor name, or description.
+    Falls back to a title-only search when the database is saturated.
+    Keywords shorter than NGRAM_TOKEN_SIZE are matched with LIKE instead of the FULLTEXT index.
 
     Args:
         query_executor (QueryExecutor): The query executor instance.
@@ -125,9 +136,28 @@ def movies_by_keyword(query_executor: QueryExecutor, db_name: str, keyword: str)
     Returns:
         List[tuple]: A list of tuples with movie details (title, actor, description).
     """
-    query = queries.search_by_keyword
-    params = (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%")
-    return query_executor.execute_select(db_name, query, params)
+    if len(keyword.strip()) < NGRAM_TOKEN_SIZE:
+        query = queries.search_by_keyword_short
+        params = (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%")
+    else:
+        query = queries.search_by_keyword
+        params = (_phrase(keyword),)
+    fallback = (queries.search_by_keyword_title_only, (f"%{keyword}%",))
+    return query_executor.execute_select(db_name, query, params, query_type="keyword_search", fallback=fallback)
+
+
+def _phrase(term: str) -> str:
+    """
+    Quotes a search term as a FULLTEXT phrase, which the ngram parser
+    matches as a substring.
+
+    Args:
+        term (str): The search term.
+
+    Returns:
+        str: The term in double quotes, with its own double quotes removed.
+    """
+    return '"' + term.replace('"', ' ') + '"'
 
 
 # Analytics Functions
@@ -144,7 +174,7 @@ def popular_search_types(query_executor: QueryExecutor, db_name: str):
         List[tuple]: A list of tuples with search types and their usage counts.
     """
     query = queries.popular_searches_by_type
-    return query_executor.execute_select(db_name, query)
+    return query_executor.execute_select(db_name, query, query_type="analytics")
 
 @safe_execute
 def popular_search_terms(query_executor: QueryExecutor, db_name: str):
@@ -159,7 +189,7 @@ def popular_search_terms(query_executor: QueryExecutor, db_name: str):
         List[tuple]: A list of tuples with search terms and their usage counts.
     """
     query = queries.popular_searches_by_term
-    return query_executor.execute_select(db_name, query)
+    return query_executor.execute_select(db_name, query, query_type="analytics")
     
 @safe_execute
 def popular_searches_today(query_executor: QueryExecutor, db_name: str):
@@ -174,7 +204,7 @@ def popular_searches_today(query_executor: QueryExecutor, db_name: str):
         List[tuple]: A list of tuples with search terms and their usage counts for today.
     """
     query = queries.popular_searches_today
-    return query_executor.execute_select(db_name, query)
+    return query_executor.execute_select(db_name, query, query_type="analytics")
 
 @safe_execute
 def popular_searches_month(query_executor: QueryExecutor, db_name: str):
@@ -189,7 +219,7 @@ def popular_searches_month(query_executor: QueryExecutor, db_name: str):
         List[tuple]: A list of tuples with search terms and their usage counts for the current month.
     """
     query = queries.popular_searches_month
-    return query_executor.execute_select(db_name, query)
+    return query_executor.execute_select(db_name, query, query_type="analytics")
 
 
 # log Functions
@@ -0,0 +1,648 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+import argparse
+import contextlib
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import psutil
+from mysql.connector import Error
+import functions
+import db_mod
+import log_storage
+import search_index
+import queries
+import utils
+from singleflight import SingleFlight
+
+# Search terms replayed by the simulated users.
+ACTOR_NAMES = ["PENELOPE", "NICK WAHLBERG", "ED CHASE", "JENNIFER DAVIS", "GUINESS", "BETTE NICHOLSON"]
+TITLES = ["ACADEMY", "DINOSAUR", "AIRPORT", "CHAMBER", "LOVE", "ZOO"]
+KEYWORDS = ["a", "drama", "epic", "boat", "JOHNNY", "Mad Scientist", "Canadian Rockies"]
+YEARS = list(range(1980, 2024))
+
+# Relative frequency of each menu flow.
+FLOW_WEIGHTS = {
+    "category_search": 20,
+    "actor_search": 15,
+    "title_search": 20,
+    "year_search": 10,
+    "category_year_search": 10,
+    "keyword_search": 10,
+    "popular_search_types": 4,
+    "popular_search_terms": 4,
+    "popular_searches_today": 4,
+    "popular_searches_month": 3,
+}
+
+
+# Flows, replaying the branches of main.main without the prompts and display.
+# Each returns False if a step came back as None from safe_execute.
+
+def flow_category_search(query_executor, connection_manager, rng) -> bool:
+    categories = functions.categories(query_executor, connection_manager.main_db)
+    if not categories:
+        return False
+    category_id = rng.choice([c[0] for c in categories])
+    results = functions.movies_by_category(query_executor, connection_manager.main_db, category_id)
+    category_name = query_executor.execute_select(connection_manager.main_db, queries.category_name_query, (category_id,))
+    if category_name:
+        functions.log_query(query_executor, "category_search", category_name[0][0])
+    return results is not None and category_name is not None
+
+
+def flow_actor_search(query_executor, connection_manager, rng) -> bool:
+    actor_name = rng.choice(ACTOR_NAMES)
+    results = functions.movies_by_actor(query_executor, connection_manager.main_db, actor_name)
+    functions.log_query(query_executor, "actor_search", actor_name)
+    return results is not None
+
+
+def flow_title_search(query_executor, connection_manager, rng) -> bool:
+    title = rng.choice(TITLES)
+    results = functions.movies_by_title(query_executor, connection_manager.main_db, title)
+    functions.log_query(query_executor, "title_search", title)
+    return results is not None
+
+
+def flow_year_search(query_executor, connection_manager, rng) -> bool:
+    year = rng.choice(YEARS)
+    results = functions.movies_by_year(query_executor, connection_manager.main_db, year)
+    functions.log_query(query_executor, "year_search", str(year))
+    return results is not None
+
+
+def flow_category_year_search(query_executor, connection_manager, rng) -> bool:
+    categories = functions.categories(query_executor, connection_manager.main_db)
+    if not categories:
+        return False
+    category_name = rng.choice([c[1] for c in categories])
+    year = rng.choice(YEARS)
+    results = functions.movies_by_category_and_year(query_executor, connection_manager.main_db, category_name, year)
+    functions.log_query(query_executor, "category_year_search", f"{category_name}, {year}")
+    return results is not None
+
+
+def flow_keyword_search(query_executor, connection_manager, rng) -> bool:
+    keyword = rng.choice(KEYWORDS)
+    results = functions.movies_by_keyword(query_executor, connection_manager.main_db, keyword)
+    functions.log_query(query_executor, "keyword_search", keyword)
+    return results is not None
+
+
+def _analytics_flow(func: Callable) -> Callable:
+    def flow(query_executor, connection_manager, rng) -> bool:
+        return func(query_executor, connection_manager.log_db) is not None
+    return flow
+
+
+FLOWS: Dict[str, Callable] = {
+    "category_search": flow_category_search,
+    "actor_search": flow_actor_search,
+    "title_search": flow_title_search,
+    "year_search": flow_year_search,
+    "category_year_search": flow_category_year_search,
+    "keyword_search": flow_keyword_search,
+    "popular_search_types": _analytics_flow(functions.popular_search_types),
+    "popular_search_terms": _analytics_flow(functions.popular_search_terms),
+    "popular_searches_today": _analytics_flow(functions.popular_searches_today),
+    "popular_searches_month": _analytics_flow(functions.popular_searches_month),
+}
+
+
+# Embedded stand-in for MySQL
+
+STAND_IN_CATEGORIES = [
+    (1, "Action"), (2, "Animation"), (3, "Children"), (4, "Classics"), (5, "Comedy"),
+    (6, "Documentary"), (7, "Drama"), (8, "Family"), (9, "Foreign"), (10, "Games"),
+    (11, "Horror"), (12, "Music"), (13, "New"), (14, "Sci-Fi"), (15, "Sports"), (16, "Travel"),
+]
+
+
+class StandInServer:
+    """
+    An in-process stand-in for the MySQL server.
+
+    Statements queue for a fixed number of server threads and hold one for a
+    simulated service time, so latency grows once the load exceeds capacity.
+    Like MySQL, a statement fails with errno 3024 when its service time exceeds
+    its MAX_EXECUTION_TIME hint, and with errno 1317 when KILL QUERY interrupts it.
+
+    Attributes:
+        latency_ms (float): The mean service time of a statement.
+        open_connections (int): The number of connections currently open.
+    """
+    def __init__(self, latency_ms: float = 5.0, server_threads: int = 8, seed: Optional[int] = None):
+        """
+        Initializes the StandInServer.
+
+        Args:
+            latency_ms (float): The mean service time of a statement.
+            server_threads (int): How many statements run at the same time.
+            seed (Optional[int]): Seed for the service time jitter.
+        """
+        self.latency_ms = latency_ms
+        self.open_connections = 0
+        self._threads = threading.Semaphore(server_threads)
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._next_id = 0
+        self._connections: Dict[int, "StandInConnection"] = {}
+
+    def connect(self) -> "StandInConnection":
+        with self._lock:
+            self.open_connections += 1
+            self._next_id += 1
+            connection = StandInConnection(self, self._next_id)
+            self._connections[connection.connection_id] = connection
+            return connection
+
+    def disconnect(self, connection: "StandInConnection") -> None:
+        with self._lock:
+            self.open_connections -= 1
+            self._connections.pop(connection.connection_id, None)
+
+    def run(self, connection: "StandInConnection", query: str, params: Optional[tuple]) -> List[Tuple]:
+        """
+        Simulates one statement and returns canned rows shaped like the real results.
+
+        Args:
+            connection (StandInConnection): The connection running the statement.
+            query (str): The SQL statement.
+            params (Optional[tuple]): Parameters for the SQL statement.
+
+        Returns:
+            List[Tuple]: The result rows.
+
+        Raises:
+            Error: If the statement exceeds its time budget or is killed.
+        """
+        text = " ".join(query.split())
+        kill = re.match(r"KILL QUERY (\d+)", text)
+        if kill:
+            with self._lock:
+                target = self._connections.get(int(kill.group(1)))
+            if target is not None:
+                target.interrupted.set()
+            return []
+
+        hint = re.search(r"MAX_EXECUTION_TIME\((\d+)\)", text)
+        budget_ms = int(hint.group(1)) if hint else None
+        weight = 4 if "LIKE" in text or "MATCH" in text else 1
+        with self._lock:
+            service_ms = self._rng.expovariate(1 / (self.latency_ms * weight))
+        connection.interrupted.clear()
+        with self._threads:
+            run_ms = service_ms if budget_ms is None else min(service_ms, budget_ms)
+            if connection.interrupted.wait(run_ms / 1000):
+                raise Error(msg="Query execution was interrupted", errno=1317)
+        if budget_ms is not None and service_ms > budget_ms:
+            raise Error(msg="Query execution was interrupted, maximum statement execution time exceeded",
+                        errno=3024)
+        if not text.upper().lstrip().startswith("SELECT"):
+            return []
+        if "FROM category;" in text:
+            return list(STAND_IN_CATEGORIES)
+        if "name FROM category WHERE" in text:
+            return [(dict(STAND_IN_CATEGORIES)[params[0]],)]
+        if "COUNT(*)" in text:
+            return [(f"term {i}", 10 - i) for i in range(5)]
+        return [(f"FILM {i}", 2006, "A stand-in film") for i in range(20)]
+
+
+class StandInConnection:
+    """
+    A connection to the StandInServer with the parts of the
+    mysql.connector connection API used by QueryExecutor.
+    """
+    def __init__(self, server: StandInServer, connection_id: int):
+        self.server = server
+        self.connection_id = connection_id
+        self.interrupted = threading.Event()
+        self._connected = True
+
+    @contextlib.contextmanager
+    def cursor(self):
+        yield StandInCursor(self)
+
+    def commit(self) -> None:
+        pass
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def close(self) -> None:
+        if self._connected:
+            self._connected = False
+            self.server.disconnect(self)
+
+
+class StandInCursor:
+    """
+    A cursor on a StandInConnection.
+    """
+    def __init__(self, connection: StandInConnection):
+        self.connection = connection
+        self._rows: List[Tuple] = []
+
+    def execute(self, query: str, params: Optional[tuple] = None) -> None:
+        self._rows = self.connection.server.run(self.connection, query, params)
+
+    def fetchall(self) -> List[Tuple]:
+        return self._rows
+
+
+class StandInConnectionManager(db_mod.ConnectionManager):
+    """
+    A ConnectionManager whose connections go to a StandInServer.
+
+    Attributes:
+        server (StandInServer): The stand-in server.
+    """
+    def __init__(self, server: StandInServer):
+        """
+        Initializes the StandInConnectionManager and connects to the stand-in server.
+
+        Args:
+            server (StandInServer): The stand-in server.
+        """
+        self.server = server
+        self.connections = {}
+        self.configs = {"sakila": {}, "queries": {}}
+        self.initialize_connections()
+        self.main_db = "sakila"
+        self.log_db = "queries"
+
+    def open_connection(self, db_name: str) -> StandInConnection:
+        return self.server.connect()
+
+
+# Load generator
+
+class LatencyHistogram:
+    """
+    Counts flow latencies in fixed geometric buckets, so memory stays constant
+    however long the run. Percentiles are accurate to one bucket (10 %).
+
+    Attributes:
+        count (int): The number of recorded flows.
+        errors (int): The number of recorded flows that failed.
+        max (float): The longest recorded latency, in seconds.
+    """
+    MIN_SECONDS = 0.0001
+    GROWTH = 1.1
+    BUCKETS = 160
+
+    def __init__(self):
+        self._buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.errors = 0
+        self.max = 0.0
+
+    def add(self, latency: float, ok: bool) -> None:
+        """
+        Records one flow.
+
+        Args:
+            latency (float): The latency of the flow, in seconds.
+            ok (bool): Whether the flow succeeded.
+        """
+        index = 0
+        if latency > self.MIN_SECONDS:
+            index = min(self.BUCKETS - 1, math.ceil(math.log(latency / self.MIN_SECONDS, self.GROWTH)))
+        self._buckets[index] += 1
+        self.count += 1
+        self.errors += 0 if ok else 1
+        self.max = max(self.max, latency)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the given percentile.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The latency in seconds, at most the recorded maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self._buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.max, self.MIN_SECONDS * self.GROWTH ** index)
+        return self.max
+
+    def summary(self, seconds: float) -> Dict[str, float]:
+        """
+        Summarises the recorded flows.
+
+        Args:
+            seconds (float): The time over which the flows were recorded.
+
+        Returns:
+            Dict[str, float]: Count, throughput, error rate, p50, p95, p99 and max latency.
+        """
+        return {
+            "count": self.count,
+            "throughput": self.count / seconds if seconds else 0.0,
+            "error_rate": self.errors / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class LoadTest:
+    """
+    Runs simulated users through the menu flows of main.main and measures the outcome.
+
+    Users are started evenly over the ramp period and each runs its own
+    ConnectionManager and QueryExecutor. The executors share one
+    AdmissionController and one SingleFlight, as users of one process would.
+
+    Attributes:
+        users (int): The number of simulated users at full load.
+        ramp_seconds (float): The time over which users are started.
+        duration_seconds (float): The total length of the run.
+        think_time (float): The mean pause between two flows of one user, in seconds.
+        step_seconds (float): The length of the intervals reported in the timeline.
+        timeline (List[Dict[str, Any]]): Resource samples and flow statistics of every step.
+    """
+    def __init__(self, make_connection_manager: Callable[[], db_mod.ConnectionManager],
+                 users: int = 10, ramp_seconds: float = 30.0, duration_seconds: float = 60.0,
+                 think_time: float = 0.0, step_seconds: float = 5.0, seed: Optional[int] = None,
+                 count_connections: Optional[Callable[[], Optional[int]]] = None):
+        """
+        Initializes the LoadTest.
+
+        Args:
+            make_connection_manager (Callable[[], db_mod.ConnectionManager]):
+                Creates the ConnectionManager of one simulated user.
+            users (int): The number of simulated users at full load.
+            ramp_seconds (float): The time over which users are started.
+            duration_seconds (float): The total length of the run.
+            think_time (float): The mean pause between two flows of one user, in seconds.
+            step_seconds (float): The length of the intervals reported in the timeline.
+            seed (Optional[int]): Seed for the choice of flows and search terms.
+            count_connections (Optional[Callable[[], Optional[int]]]):
+                Returns the number of connections open on the server.
+        """
+        self.make_connection_manager = make_connection_manager
+        self.users = users
+        self.ramp_seconds = ramp_seconds
+        self.duration_seconds = duration_seconds
+        self.think_time = think_time
+        self.step_seconds = step_seconds
+        self.seed = seed
+        self.count_connections = count_connections
+        self.admission = db_mod.AdmissionController()
+        self.single_flight = SingleFlight()
+        self._flows: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in FLOWS}
+        self._overall = LatencyHistogram()
+        self._step = LatencyHistogram()
+        self.timeline: List[Dict[str, Any]] = []
+        self.aborted_users = 0
+        self._active_users = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Runs the load test. Output printed by the application is discarded meanwhile.
+
+        Returns:
+            Dict[str, Any]: The report built by report().
+        """
+        errors_before = dict(utils.ERROR_COUNTS)
+        process = psutil.Process()
+        self._start = time.monotonic()
+        self._step_start = self._start
+        self._rss_start = process.memory_info().rss
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            threads = []
+            for user_id in range(self.users):
+                delay = self.ramp_seconds * user_id / self.users
+                thread = threading.Thread(target=self._user, args=(user_id, delay), daemon=True)
+                thread.start()
+                threads.append(thread)
+            monitor = threading.Thread(target=self._monitor, args=(process,), daemon=True)
+            monitor.start()
+
+            self._stop.wait(self.duration_seconds)
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            monitor.join()
+            # The last, partial step, including flows that finished after the stop.
+            self._sample(process)
+
+        self._errors = {kind: count - errors_before.get(kind, 0) for kind, count in utils.ERROR_COUNTS.items()}
+        self._rss_end = process.memory_info().rss
+        return self.report()
+
+    def _user(self, user_id: int, delay: float) -> None:
+        """
+        Runs one simulated user until the test stops.
+
+        Args:
+            user_id (int): The number of the user.
+            delay (float): The time to wait before starting, in seconds.
+        """
+        if self._stop.wait(delay):
+            return
+        rng = random.Random(None if self.seed is None else self.seed + user_id)
+        names = list(FLOW_WEIGHTS)
+        weights = [FLOW_WEIGHTS[name] for name in names]
+        try:
+            with self.make_connection_manager() as connection_manager:
+                query_executor = db_mod.QueryExecutor(connection_manager, self.admission, self.single_flight)
+                with self._lock:
+                    self._active_users += 1
+                try:
+                    while not self._stop.is_set():
+                        name = rng.choices(names, weights)[0]
+                        started = time.monotonic()
+                        ok = FLOWS[name](query_executor, connection_manager, rng)
+                        latency = time.monotonic() - started
+                        with self._lock:
+                            self._flows[name].add(latency, ok)
+                            self._overall.add(latency, ok)
+                            self._step.add(latency, ok)
+                        if self.think_time:
+                            self._stop.wait(rng.expovariate(1 / self.think_time))
+                finally:
+                    with self._lock:
+                        self._active_users -= 1
+        except SystemExit:
+            # safe_execute exits on connection errors; only this user stops.
+            with self._lock:
+                self.aborted_users += 1
+
+    def _monitor(self, process: psutil.Process) -> None:
+        """
+        Samples active users, connections, memory and the flows completed
+        during the step, every step until the test stops.
+
+        Args:
+            process (psutil.Process): The process running the test.
+        """
+        while not self._stop.wait(self.step_seconds):
+            self._sample(process)
+
+    def _sample(self, process: psutil.Process) -> None:
+        """
+        Appends one timeline entry covering the flows completed since the previous one.
+
+        Args:
+            process (psutil.Process): The process running the test.
+        """
+        now = time.monotonic()
+        with self._lock:
+            active_users = self._active_users
+            step, self._step = self._step, LatencyHistogram()
+            step_start, self._step_start = self._step_start, now
+        sample = {
+            "time": now - self._start,
+            "active_users": active_users,
+            "connections": self.count_connections() if self.count_connections else None,
+            "rss": process.memory_info().rss,
+        }
+        sample.update(step.summary(now - step_start))
+        self.timeline.append(sample)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarises the statistics collected by run().
+
+        Returns:
+            Dict[str, Any]: Overall and per-flow throughput, latency percentiles
+            and error rates, the per-step timeline, the errors counted by
+            safe_execute, admission and single-flight counters and memory growth.
+        """
+        elapsed = max(time.monotonic() - self._start, 1e-9)
+        return {
+            "elapsed": elapsed,
+            "overall": self._overall.summary(elapsed),
+            "flows": {name: histogram.summary(elapsed)
+                      for name, histogram in sorted(self._flows.items()) if histogram.count},
+            "timeline": self.timeline,
+            "safe_execute_errors": self._errors,
+            "aborted_users": self.aborted_users,
+            "admission": dict(self.admission.stats),
+            "single_flight": dict(self.single_flight.stats),
+            "rss_start": self._rss_start,
+            "rss_end": self._rss_end,
+            "rss_peak": max([self._rss_end] + [s["rss"] for s in self.timeline]),
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """
+    Prints a load test report in a formatted way.
+
+    Args:
+        report (Dict[str, Any]): The report returned by LoadTest.run().
+    """
+    def row(label: str, stats: Dict[str, float]) -> str:
+        return (f"{label:<24} {stats['count']:>7} {stats['throughput']:>8.1f} {stats['error_rate']:>7.1%} "
+                f"{stats['p50'] * 1000:>8.1f} {stats['p95'] * 1000:>8.1f} {stats['p99'] * 1000:>8.1f} "
+                f"{stats['max'] * 1000:>8.1f}")
+
+    header = f"{'Flow':<24} {'Count':>7} {'Ops/s':>8} {'Errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    print(f"\nRun time: {report['elapsed']:.1f} s")
+    print("\n" + header)
+    print("-" * len(header))
+    for name, stats in report["flows"].items():
+        print(row(name, stats))
+    print("-" * len(header))
+    print(row("total", report["overall"]))
+
+    print(f"\n{'Time s':>7} {'Users':>6} {'Conns':>6} {'RSS MB':>8} {'Ops/s':>8} {'Errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for step in report["timeline"]:
+        connections = "-" if step["connections"] is None else step["connections"]
+        print(f"{step['time']:>7.1f} {step['active_users']:>6} {connections:>6} {step['rss'] / 2 ** 20:>8.1f} "
+              f"{step['throughput']:>8.1f} {step['error_rate']:>7.1%} {step['p50'] * 1000:>8.1f} "
+              f"{step['p95'] * 1000:>8.1f} {step['p99'] * 1000:>8.1f}")
+
+    print(f"\nErrors handled by safe_execute: {report['safe_execute_errors'] or 'none'}")
+    print(f"Users aborted by connection errors: {report['aborted_users']}")
+    print(f"Admission control: {report['admission']}")
+    print(f"Single-flight: {report['single_flight']}")
+    print(f"Memory (RSS): {report['rss_start'] / 2 ** 20:.1f} MB at start, "
+          f"{report['rss_peak'] / 2 ** 20:.1f} MB peak, {report['rss_end'] / 2 ** 20:.1f} MB at end")
+
+
+def _mysql_connection_counter(connection_manager: db_mod.ConnectionManager) -> Callable[[], Optional[int]]:
+    """
+    Creates a function reading Threads_connected from the main MySQL server.
+
+    Args:
+        connection_manager (db_mod.ConnectionManager): The harness's own connections,
+            which are not counted.
+
+    Returns:
+        Callable[[], Optional[int]]: Returns the number of clients connected
+        by the simulated users, or None on failure.
+    """
+    monitor = db_mod.QueryExecutor(connection_manager)
+    main_host = connection_manager.configs[connection_manager.main_db]["host"]
+    own_connections = sum(1 for config in connection_manager.configs.values() if config["host"] == main_host)
+    lock = threading.Lock()
+
+    def count() -> Optional[int]:
+        with lock:
+            rows = monitor.execute_select(connection_manager.main_db, "SHOW GLOBAL STATUS LIKE 'Threads_connected';")
+        return int(rows[0][1]) - own_connections if rows else None
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the movie search flows with simulated users.")
+    parser.add_argument("--backend", choices=["mysql", "stand-in"], default="stand-in",
+                        help="the MySQL servers from .env, or the embedded stand-in")
+    parser.add_argument("--users", type=int, default=10, help="simulated users at full load")
+    parser.add_argument("--ramp", type=float, default=30.0, help="seconds over which users are started")
+    parser.add_argument("--duration", type=float, default=60.0, help="total run time in seconds")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between flows in seconds")
+    parser.add_argument("--step", type=float, default=5.0, help="timeline interval in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="stand-in mean statement time")
+    parser.add_argument("--server-threads", type=int, default=8, help="stand-in concurrent statements")
+    args = parser.parse_args()
+
+    if args.backend == "stand-in":
+        server = StandInServer(args.latency_ms, args.server_threads, args.seed)
+        load_test = LoadTest(lambda: StandInConnectionManager(server), args.users, args.ramp, args.duration,
+                             args.think_time, args.step, args.seed, lambda: server.open_connections)
+        print_report(load_test.run())
+        return
+
+    with db_mod.ConnectionManager() as connection_manager:
+        # Prepare the log and search tables the way main.main does.
+        query_executor = db_mod.QueryExecutor(connection_manager)
+        log_storage.LogStorageManager(query_executor, connection_manager.log_db).maintain()
+        search_index.FilmSearchIndex(query_executor, connection_manager.main_db).refresh()
+
+        load_test = LoadTest(db_mod.ConnectionManager, args.users, args.ramp, args.duration,
+                             args.think_time, args.step, args.seed, _mysql_connection_counter(connection_manager))
+        print_report(load_test.run())
+
+
+if __name__ == "__main__":
+    main()
+
+
+# In[ ]:
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+import os
+import csv
+import gzip
+import logging
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+from mysql.connector import Error
+import queries
+from db_mod import ConnectionManager, QueryExecutor
+from utils import safe_execute
+
+# Offset between date.toordinal() and MySQL TO_DAYS().
+TO_DAYS_OFFSET = 365
+
+FUTURE_PARTITION = "p_future"
+HISTORY_PARTITION = "p_history"
+
+# Relative archive directories are resolved against the application directory.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_BATCH_ROWS = 10000
+
+
+class LogStorageManager:
+    """
+    Keeps the 'queries' log table range-partitioned by day or month on `timestamp`.
+
+    Monthly partitions (the default) let both the today and the this-month
+    analytics queries prune to a single partition. Daily partitions make
+    retention finer-grained, but the monthly query then reads up to 31 partitions.
+
+    New partitions are split off the catch-all `p_future` partition ahead of time,
+    and partitions older than the retention period are archived to gzip CSV files
+    and dropped. This DDL runs from the `python log_storage.py` job (e.g. cron);
+    the application only calls check() at startup. Inserts never fail when the
+    job is late, since `p_future` takes every row past the last partition.
+
+    Attributes:
+        query_executor (QueryExecutor): The query executor instance.
+        db_name (str): The name of the logging database.
+        granularity (str): 'day' or 'month', the size of one partition.
+        retention_days (int): How many days of log rows are kept in the table.
+        partitions_ahead (int): How many future partitions are kept ready.
+        archive_dir (str): The absolute path where expired partitions are
+            archived, or "" to drop them without archiving.
+    """
+    def __init__(self, query_executor: QueryExecutor, db_name: str = "queries",
+                 granularity: Optional[str] = None, retention_days: Optional[int] = None,
+                 partitions_ahead: Optional[int] = None, archive_dir: Optional[str] = None):
+        """
+        Initializes the LogStorageManager. Settings not given are read from
+        the LOG_PARTITION_GRANULARITY, LOG_RETENTION_DAYS, LOG_PARTITIONS_AHEAD
+        and LOG_ARCHIVE_DIR environment variables.
+
+        Args:
+            query_executor (QueryExecutor): The query executor instance.
+            db_name (str): The name of the logging database.
+            granularity (Optional[str]): 'day' or 'month'.
+            retention_days (Optional[int]): How many days of log rows are kept.
+            partitions_ahead (Optional[int]): How many future partitions are kept ready.
+            archive_dir (Optional[str]): Where expired partitions are archived,
+                "" to drop them without archiving. Relative paths are resolved
+                against the application directory. Defaults to LOG_ARCHIVE_DIR,
+                or "log_archive".
+        """
+        self.query_executor = query_executor
+        self.db_name = db_name
+        self.granularity = granularity or os.getenv("LOG_PARTITION_GRANULARITY", "month")
+        if self.granularity not in ("day", "month"):
+            raise ValueError(f"Unknown partition granularity: {self.granularity}")
+        self.retention_days = int(retention_days if retention_days is not None
+                                  else os.getenv("LOG_RETENTION_DAYS", "400"))
+        self.partitions_ahead = int(partitions_ahead if partitions_ahead is not None
+                                    else os.getenv("LOG_PARTITIONS_AHEAD", "7"))
+        if archive_dir is None:
+            archive_dir = os.getenv("LOG_ARCHIVE_DIR", "log_archive")
+        self.archive_dir = os.path.join(BASE_DIR, archive_dir) if archive_dir else ""
+
+    @safe_execute
+    def maintain(self, today: Optional[date] = None) -> None:
+        """
+        Provisions the table if needed, rolls partitions forward and expires old ones.
+
+        Args:
+            today (Optional[date]): The current date, defaults to date.today().
+        """
+        today = today or date.today()
+        self.provision(today)
+        self.roll_forward(today)
+        self.expire(today)
+
+    def check(self, today: Optional[date] = None) -> bool:
+        """
+        Checks, without any DDL, that the table is partitioned and that the
+        partitions ahead are in place, and logs a warning if not.
+
+        Args:
+            today (Optional[date]): The current date, defaults to date.today().
+
+        Returns:
+            bool: True if the log storage job has nothing to add.
+        """
+        today = today or date.today()
+        try:
+            partitions = self._partitions()
+        except RuntimeError as e:
+            logging.warning(f"Log storage check failed: {e}")
+            return False
+        if not partitions or partitions[0][0] is None:
+            logging.warning("The 'queries' table is not partitioned, run log_storage.py")
+            return False
+        if self._missing_partitions(today, partitions):
+            logging.warning("The 'queries' table needs new partitions, run log_storage.py")
+            return False
+        return True
+
+    def provision(self, today: date) -> None:
+        """
+        Creates the partitioned table, or partitions an existing monolithic one.
+
+        An existing table is expected to have the columns id, search_type,
+        search_term and timestamp; its rows all go to the history partition.
+
+        Args:
+            today (date): The current date.
+        """
+        partitions = self._partitions()
+        if partitions and partitions[0][0] is not None:
+            return
+        layout = self._initial_layout(today)
+        if not partitions:
+            self.query_executor.execute_non_select(
+                self.db_name, queries.create_queries_table.format(partitions=layout))
+        else:
+            logging.warning("Partitioning the existing 'queries' table")
+            self.query_executor.execute_non_select(self.db_name, queries.prepare_queries_table)
+            self.query_executor.execute_non_select(
+                self.db_name, queries.partition_queries_table.format(partitions=layout))
+
+    def roll_forward(self, today: date) -> None:
+        """
+        Splits new partitions off `p_future` so that `partitions_ahead`
+        buckets after the current one are ready.
+
+        Args:
+            today (date): The current date.
+        """
+        new_partitions = self._missing_partitions(today, self._partitions())
+        if not new_partitions:
+            return
+        new_partitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE")
+        self.query_executor.execute_non_select(
+            self.db_name, queries.split_future_partition.format(partitions=", ".join(new_partitions)))
+
+    def _missing_partitions(self, today: date, partitions: List[Tuple[Optional[str], Optional[int]]]) -> List[str]:
+        """
+        Builds the definitions of the partitions roll_forward would add.
+
+        Args:
+            today (date): The current date.
+            partitions (List[Tuple[Optional[str], Optional[int]]]): The partitions from _partitions().
+
+        Returns:
+            List[str]: The missing partition definitions, oldest first.
+        """
+        bounds = [bound for name, bound in partitions if bound is not None]
+        if not bounds:
+            return []
+        target = self._bucket_start(today)
+        for _ in range(self.partitions_ahead + 1):
+            target = self._next_bucket(target)
+
+        start = _from_days(max(bounds))
+        definitions = []
+        while start < target:
+            end = self._next_bucket(start)
+            definitions.append(_partition_definition(self._partition_name(start), end))
+            start = end
+        return definitions
+
+    def expire(self, today: date) -> None:
+        """
+        Archives and drops the partitions whose rows are all older than the retention period.
+
+        Args:
+            today (date): The current date.
+
+        Raises:
+            RuntimeError: If a partition could not be dropped.
+        """
+        cutoff = _to_days(self._bucket_start(today - timedelta(days=self.retention_days)))
+        for name, bound in self._partitions():
+            if bound is None or bound > cutoff:
+                continue
+            if self.archive_dir:
+                self.archive(name)
+            self.query_executor.execute_non_select(
+                self.db_name, queries.drop_partition.format(partition=name))
+            if any(remaining == name for remaining, _ in self._partitions()):
+                raise RuntimeError(f"Failed to drop partition {name}")
+
+    def archive(self, partition: str) -> Optional[str]:
+        """
+        Streams the rows of one partition to a gzip CSV file under archive_dir,
+        replacing the file left by an earlier attempt.
+
+        The rows are read in batches on a dedicated connection, bypassing the
+        executor's time budget, single-flight and admission control.
+
+        Args:
+            partition (str): The name of the partition.
+
+        Returns:
+            Optional[str]: The path of the archive file.
+
+        Raises:
+            RuntimeError: If the rows of the partition cannot be read.
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"queries_{partition}.csv.gz")
+        temp_path = path + ".tmp"
+        try:
+            connection = self.query_executor.connection_manager.open_connection(self.db_name)
+            try:
+                with connection.cursor() as cursor, gzip.open(temp_path, "wt", newline="") as archive_file:
+                    writer = csv.writer(archive_file)
+                    cursor.execute(queries.select_partition_rows.format(partition=partition))
+                    while True:
+                        rows = cursor.fetchmany(ARCHIVE_BATCH_ROWS)
+                        if not rows:
+                            break
+                        writer.writerows(rows)
+            finally:
+                connection.close()
+        except Error as e:
+            logging.error(f"Archiving error ({partition}): {e}")
+            raise RuntimeError(f"Failed to read partition {partition} for archiving") from e
+        os.replace(temp_path, path)
+        return path
+
+    def _partitions(self) -> List[Tuple[Optional[str], Optional[int]]]:
+        """
+        Lists the partitions of the table in order.
+
+        Returns:
+            List[Tuple[Optional[str], Optional[int]]]: Partition names and their
+            TO_DAYS upper bounds, None for MAXVALUE. A single (None, None) entry
+            means the table exists but is not partitioned; an empty list means
+            it does not exist.
+        """
+        rows = self.query_executor.execute_select(self.db_name, queries.queries_partitions, query_type="maintenance")
+        if rows is None:
+            raise RuntimeError("Failed to read the partitions of the 'queries' table")
+        partitions = []
+        for name, description in rows:
+            if description is None or description == "MAXVALUE":
+                partitions.append((name, None))
+            else:
+                partitions.append((name, int(description)))
+        return partitions
+
+    def _initial_layout(self, today: date) -> str:
+        """
+        Builds the partition definitions for a newly partitioned table.
+
+        Args:
+            today (date): The current date.
+
+        Returns:
+            str: The partition definitions, separated by commas.
+        """
+        start = self._bucket_start(today)
+        definitions = [_partition_definition(HISTORY_PARTITION, start)]
+        for _ in range(self.partitions_ahead + 1):
+            end = self._next_bucket(start)
+            definitions.append(_partition_definition(self._partition_name(start), end))
+            start = end
+        definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE")
+        return ", ".join(definitions)
+
+    def _bucket_start(self, day: date) -> date:
+        if self.granularity == "month":
+            return day.replace(day=1)
+        return day
+
+    def _next_bucket(self, start: date) -> date:
+        if self.granularity == "month":
+            return (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        return start + timedelta(days=1)
+
+    def _partition_name(self, start: date) -> str:
+        if self.granularity == "month":
+            return start.strftime("p%Y%m")
+        return start.strftime("p%Y%m%d")
+
+
+def _to_days(day: date) -> int:
+    return day.toordinal() + TO_DAYS_OFFSET
+
+
+def _from_days(days: int) -> date:
+    return date.fromordinal(days - TO_DAYS_OFFSET)
+
+
+def _partition_definition(name: str, end: date) -> str:
+    return f"PARTITION {name} VALUES LESS THAN ({_to_days(end)})"
+
+
+# Run periodically, e.g. daily from cron, to provision, roll forward and expire partitions.
+if __name__ == "__main__":
+    with ConnectionManager() as connection_manager:
+        LogStorageManager(QueryExecutor(connection_manager), connection_manager.log_db).maintain()
+
+
+# In[ ]:
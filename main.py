@@ -8,10 +8,14 @@ import functions
 import db_mod
 import ui
 import queries
+import log_storage
+import search_index
 
 def main():
     with db_mod.ConnectionManager() as connection_manager:
         query_executor = db_mod.QueryExecutor(connection_manager)
+        log_storage.LogStorageManager(query_executor, connection_manager.log_db).check()
+        search_index.FilmSearchIndex(query_executor, connection_manager.main_db).refresh()
 
 
         while True:
@@ -36,7 +40,7 @@ def main():
                     elif search_choice == 2:  # Search by Actor
                         actor_name = ui.input_process("Enter the actor's name: ")
                         results = functions.movies_by_actor(query_executor, connection_manager.main_db, actor_name)
-                        ui.display_with_limit(results, ["Title", "Actor"])
+                        ui.display_with_limit(results, ["Title", "Actors"])
                         functions.log_query(query_executor, "actor_search", actor_name)
 
                     elif search_choice == 3:  # Search by Title
@@ -33,11 +33,9 @@ WHERE release_year = %s;
 """
 
 search_by_category_and_year = """
-SELECT f.title, f.release_year, c.name AS category, f.description
-FROM film f
-JOIN film_category fc ON f.film_id = fc.film_id
-JOIN category c ON fc.category_id = c.category_id
-WHERE c.name = %s AND f.release_year = %s;
+SELECT title, release_year, category_name AS category, description
+FROM film_search
+WHERE category_name = %s AND release_year = %s;
 """
 
 search_by_title = """
@@ -47,25 +45,134 @@ WHERE title LIKE %s;
 """
 
 search_by_actor = """
-SELECT f.title, CONCAT(a.first_name, ' ', a.last_name) AS actor
-FROM film f
-JOIN film_actor fa ON f.film_id = fa.film_id
-JOIN actor a ON fa.actor_id = a.actor_id
-WHERE CONCAT(a.first_name, ' ', a.last_name) LIKE %s;
+SELECT title, actors
+FROM film_search
+WHERE MATCH(actors) AGAINST (%s IN BOOLEAN MODE)
+GROUP BY film_id, title, actors;
+"""
+
+search_by_actor_short = """
+SELECT title, actors
+FROM film_search
+WHERE actors LIKE %s
+GROUP BY film_id, title, actors;
 """
 
 search_by_keyword = """
-SELECT 
+SELECT title, actors, description
+FROM film_search
+WHERE MATCH(title, actors, description) AGAINST (%s IN BOOLEAN MODE)
+GROUP BY film_id, title, actors, description;
+"""
+
+search_by_keyword_short = """
+SELECT title, actors, description
+FROM film_search
+WHERE title LIKE %s
+   OR actors LIKE %s
+   OR description LIKE %s
+GROUP BY film_id, title, actors, description;
+"""
+
+search_by_keyword_title_only = """
+SELECT title, '' AS actors, description
+FROM film
+WHERE title LIKE %s;
+"""
+
+# Film Search Table Queries
+
+# The ngram parser drops every token containing a stopword, so stopwords are
+# disabled for the session that builds the FULLTEXT indexes.
+disable_fulltext_stopwords = """
+SET SESSION innodb_ft_enable_stopword = OFF;
+"""
+
+drop_film_search_table = """
+DROP TABLE IF EXISTS film_search;
+"""
+
+create_film_search_table = """
+CREATE TABLE IF NOT EXISTS film_search (
+    film_id SMALLINT UNSIGNED NOT NULL,
+    category_id TINYINT UNSIGNED NOT NULL,
+    title VARCHAR(128) NOT NULL,
+    description TEXT,
+    release_year YEAR,
+    category_name VARCHAR(25),
+    actors TEXT,
+    source_last_update TIMESTAMP NOT NULL,
+    PRIMARY KEY (film_id, category_id),
+    KEY idx_film_search_category_year (category_name, release_year),
+    KEY idx_film_search_source_last_update (source_last_update),
+    FULLTEXT KEY ft_film_search_actors (actors) WITH PARSER ngram,
+    FULLTEXT KEY ft_film_search_text (title, actors, description) WITH PARSER ngram
+);
+"""
+
+film_search_watermark = """
+SELECT MAX(source_last_update) FROM film_search;
+"""
+
+upsert_film_search = """
+INSERT INTO film_search (
+    film_id, category_id, title, description,
+    release_year, category_name, actors, source_last_update
+)
+SELECT
+    f.film_id,
+    COALESCE(fc.category_id, 0),
     f.title,
-    GROUP_CONCAT(DISTINCT CONCAT(a.first_name, ' ', a.last_name) SEPARATOR ', ') AS actors,
-    f.description
+    f.description,
+    f.release_year,
+    c.name,
+    GROUP_CONCAT(DISTINCT CONCAT(a.first_name, ' ', a.last_name) SEPARATOR ', '),
+    GREATEST(
+        f.last_update,
+        COALESCE(fc.last_update, f.last_update),
+        COALESCE(c.last_update, f.last_update),
+        COALESCE(MAX(fa.last_update), f.last_update),
+        COALESCE(MAX(a.last_update), f.last_update)
+    )
 FROM film f
-LEFT JOIN film_actor fa ON f.film_id = fa.film_id
-LEFT JOIN actor a ON fa.actor_id = a.actor_id
-WHERE f.title LIKE %s
-   OR CONCAT(a.first_name, ' ', a.last_name) LIKE %s
-   OR f.description LIKE %s
-GROUP BY f.film_id, f.title, f.description;
+LEFT JOIN film_category fc ON fc.film_id = f.film_id
+LEFT JOIN category c ON c.category_id = fc.category_id
+LEFT JOIN film_actor fa ON fa.film_id = f.film_id
+LEFT JOIN actor a ON a.actor_id = fa.actor_id
+{where}
+GROUP BY f.film_id, fc.category_id, c.name, fc.last_update, c.last_update
+ON DUPLICATE KEY UPDATE
+    title = VALUES(title),
+    description = VALUES(description),
+    release_year = VALUES(release_year),
+    category_name = VALUES(category_name),
+    actors = VALUES(actors),
+    source_last_update = VALUES(source_last_update);
+"""
+
+changed_films_filter = """
+WHERE f.film_id IN (
+    SELECT film_id FROM film WHERE last_update >= %s
+    UNION
+    SELECT film_id FROM film_actor WHERE last_update >= %s
+    UNION
+    SELECT fa.film_id FROM film_actor fa JOIN actor a ON a.actor_id = fa.actor_id WHERE a.last_update >= %s
+    UNION
+    SELECT film_id FROM film_category WHERE last_update >= %s
+    UNION
+    SELECT fc.film_id FROM film_category fc JOIN category c ON c.category_id = fc.category_id WHERE c.last_update >= %s
+    UNION
+    SELECT x.film_id FROM film x WHERE NOT EXISTS (SELECT 1 FROM film_search fs WHERE fs.film_id = x.film_id)
+)
+"""
+
+delete_removed_films = """
+DELETE fs FROM film_search fs
+LEFT JOIN film f ON f.film_id = fs.film_id
+LEFT JOIN film_category fc ON fc.film_id = fs.film_id AND fc.category_id = fs.category_id
+WHERE f.film_id IS NULL
+   OR (fs.category_id <> 0 AND fc.film_id IS NULL)
+   OR (fs.category_id = 0 AND EXISTS (SELECT 1 FROM film_category x WHERE x.film_id = fs.film_id));
 """
 
 # Analytics Queries
@@ -89,7 +196,8 @@ LIMIT 5;
 popular_searches_today = """
 SELECT search_term, COUNT(*) AS usage_count
 FROM queries
-WHERE DATE(timestamp) = CURRENT_DATE
+WHERE timestamp >= CURRENT_DATE
+  AND timestamp < CURRENT_DATE + INTERVAL 1 DAY
 GROUP BY search_term
 ORDER BY usage_count DESC
 LIMIT 5;
@@ -98,9 +206,63 @@ LIMIT 5;
 popular_searches_month = """
 SELECT search_term, COUNT(*) AS usage_count
 FROM queries
-WHERE MONTH(timestamp) = MONTH(CURRENT_DATE) AND YEAR(timestamp) = YEAR(CURRENT_DATE)
+WHERE timestamp >= CURRENT_DATE - INTERVAL (DAYOFMONTH(CURRENT_DATE) - 1) DAY
+  AND timestamp < CURRENT_DATE - INTERVAL (DAYOFMONTH(CURRENT_DATE) - 1) DAY + INTERVAL 1 MONTH
 GROUP BY search_term
 ORDER BY usage_count DESC
 LIMIT 5;
 """
 
+# Server Status Queries
+
+threads_running = """
+SHOW GLOBAL STATUS LIKE 'Threads_running';
+"""
+
+# Log Storage Queries
+
+queries_partitions = """
+SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+FROM information_schema.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'queries'
+ORDER BY PARTITION_ORDINAL_POSITION;
+"""
+
+create_queries_table = """
+CREATE TABLE IF NOT EXISTS queries (
+    id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    search_type VARCHAR(50) NOT NULL,
+    search_term VARCHAR(255) NOT NULL,
+    timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, timestamp),
+    KEY idx_queries_timestamp_term (timestamp, search_term)
+)
+PARTITION BY RANGE (TO_DAYS(timestamp)) ({partitions});
+"""
+
+prepare_queries_table = """
+ALTER TABLE queries
+    MODIFY timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, timestamp),
+    ADD KEY idx_queries_timestamp_term (timestamp, search_term);
+"""
+
+partition_queries_table = """
+ALTER TABLE queries
+PARTITION BY RANGE (TO_DAYS(timestamp)) ({partitions});
+"""
+
+split_future_partition = """
+ALTER TABLE queries
+REORGANIZE PARTITION p_future INTO ({partitions});
+"""
+
+select_partition_rows = """
+SELECT id, search_type, search_term, timestamp
+FROM queries PARTITION ({partition});
+"""
+
+drop_partition = """
+ALTER TABLE queries DROP PARTITION {partition};
+"""
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+import sys
+from datetime import datetime
+from typing import Optional
+import queries
+from db_mod import ConnectionManager, QueryExecutor
+from utils import safe_execute
+
+
+class FilmSearchIndex:
+    """
+    Maintains the denormalised 'film_search' table: one row per film and
+    category (category_id 0 for a film without one) with the release year,
+    description and comma-separated actor names, and ngram FULLTEXT indexes
+    for the actor and keyword searches.
+
+    Changes are detected through the `last_update` columns of film, film_actor,
+    actor, film_category and category. Removed films and category links are
+    deleted first on every refresh, and films left without any row (e.g. after
+    losing all their categories) are upserted again. Rows removed from
+    film_actor leave no `last_update` trace and are only picked up by a full
+    refresh.
+
+    Attributes:
+        query_executor (QueryExecutor): The query executor instance.
+        db_name (str): The name of the database holding the film tables.
+    """
+    def __init__(self, query_executor: QueryExecutor, db_name: str = "sakila"):
+        """
+        Initializes the FilmSearchIndex.
+
+        Args:
+            query_executor (QueryExecutor): The query executor instance.
+            db_name (str): The name of the database holding the film tables.
+        """
+        self.query_executor = query_executor
+        self.db_name = db_name
+
+    @safe_execute
+    def refresh(self, full: bool = False) -> None:
+        """
+        Creates the table if needed and upserts the films changed since the last refresh.
+
+        Args:
+            full (bool): Recreate the table and rebuild every row instead of
+                only upserting the changed films.
+        """
+        if full:
+            self.query_executor.execute_non_select(self.db_name, queries.drop_film_search_table)
+        self.query_executor.execute_non_select(self.db_name, queries.disable_fulltext_stopwords)
+        self.query_executor.execute_non_select(self.db_name, queries.create_film_search_table)
+        self.query_executor.execute_non_select(self.db_name, queries.delete_removed_films)
+        watermark = None if full else self._watermark()
+        if watermark is None:
+            query = queries.upsert_film_search.format(where="")
+            params = None
+        else:
+            query = queries.upsert_film_search.format(where=queries.changed_films_filter)
+            params = (watermark,) * 5
+        self.query_executor.execute_non_select(self.db_name, query, params)
+
+    def _watermark(self) -> Optional[datetime]:
+        """
+        Fetches the newest source `last_update` already copied into the table.
+
+        Returns:
+            Optional[datetime]: The watermark timestamp, or None if the table is empty.
+        """
+        rows = self.query_executor.execute_select(self.db_name, queries.film_search_watermark, query_type="maintenance")
+        if not rows:
+            return None
+        return rows[0][0]
+
+
+if __name__ == "__main__":
+    with ConnectionManager() as connection_manager:
+        FilmSearchIndex(QueryExecutor(connection_manager), connection_manager.main_db).refresh(full="--full" in sys.argv)
+
+
+# In[ ]:
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """
+    One in-flight execution and the result shared by its waiters.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls from several threads into one execution.
+
+    The first caller for a key runs the function; callers arriving with the same
+    key while it runs wait for it and share its result or exception. All callers
+    receive the same result object and must not mutate it.
+
+    Attributes:
+        stats (Dict[str, int]): Counters of executions and collapsed calls.
+    """
+    def __init__(self):
+        """
+        Initializes the SingleFlight with no calls in flight.
+        """
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.stats: Dict[str, int] = {"executions": 0, "collapsed": 0}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Runs func once for all concurrent callers with the same key.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            func (Callable[[], Any]): The function to run.
+
+        Returns:
+            Any: The result of func, shared by all callers.
+
+        Raises:
+            BaseException: The exception raised by func, re-raised in every waiter.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["executions"] += 1
+            else:
+                self.stats["collapsed"] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Collapses concurrent identical calls from coroutines of one event loop into one execution.
+
+    The execution runs in its own task, so cancelling one caller, the first one
+    included, does not cancel the execution or the other callers. All callers
+    receive the same result object and must not mutate it.
+
+    Attributes:
+        stats (Dict[str, int]): Counters of executions and collapsed calls.
+    """
+    def __init__(self):
+        """
+        Initializes the AsyncSingleFlight with no calls in flight.
+        """
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.stats: Dict[str, int] = {"executions": 0, "collapsed": 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits func once for all concurrent callers with the same key.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            func (Callable[[], Awaitable[Any]]): The coroutine function to await.
+
+        Returns:
+            Any: The result of func, shared by all callers.
+
+        Raises:
+            BaseException: The exception raised by func, re-raised in every caller.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.stats["collapsed"] += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            self.stats["executions"] += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        """
+        Forgets a finished execution so the next call for its key runs again.
+
+        Args:
+            key (Hashable): The key of the execution.
+            task (asyncio.Future): The finished task.
+        """
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Retrieve the exception so a task nobody awaits any more does not log a warning.
+            task.exception()
+
+
+# In[ ]:
@@ -1,5 +1,29 @@
 import sys
 import logging
+import threading
+from collections import Counter
+
+# Number of exceptions handled by safe_execute, by kind.
+ERROR_COUNTS: Counter = Counter()
+_error_counts_lock = threading.Lock()
+
+
+class QueryShedError(RuntimeError):
+    """
+    Raised when an expensive query is rejected because the database is saturated.
+    """
+
+
+class QueryTimeoutError(RuntimeError):
+    """
+    Raised when a query exceeds its time budget.
+    """
+
+
+def _count_error(kind: str) -> None:
+    with _error_counts_lock:
+        ERROR_COUNTS[kind] += 1
+
 
 def safe_execute(func):
     """
@@ -16,12 +40,23 @@ def safe_execute(func):
         try:
             return func(*args, **kwargs)
         except ConnectionError as e:
+            _count_error("connection")
             print(f"Critical error: {e}")
             sys.exit(1)
+        except QueryShedError as e:
+            _count_error("shed")
+            print(f"The server is busy right now, please try again in a moment")
+            return None
+        except QueryTimeoutError as e:
+            _count_error("timed_out")
+            print(f"The search took too long, try a more specific search")
+            return None
         except RuntimeError as e:
+            _count_error("runtime")
             print(f"Difficulties with getting results, try another search")
             return None
         except Exception as e:
+            _count_error("unexpected")
             logging.error(f"Unexpexted error: {e}")
             print(f"Difficulties with getting results, try another search")
             return None